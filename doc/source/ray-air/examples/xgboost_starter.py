@@ -7,21 +7,20 @@ from ray.data.preprocessors import StandardScaler
 from ray.air import train_test_split
 
 # Load data.
-import pandas as pd
+import pyarrow.fs
 
-bc_df = pd.read_csv(
-    "https://air-example-data.s3.us-east-2.amazonaws.com/breast_cancer.csv"
+dataset = ray.data.read_csv(
+    "s3://air-example-data/breast_cancer.csv",
+    # The example bucket is public, so no AWS credentials are needed.
+    filesystem=pyarrow.fs.S3FileSystem(anonymous=True, region="us-east-2"),
 )
-dataset = ray.data.from_pandas(bc_df)
-# Optionally, read directly from s3
-# dataset = ray.data.read_csv("s3://air-example-data/breast_cancer.csv")
 
 # Split data into train and validation.
 train_dataset, valid_dataset = train_test_split(dataset, test_size=0.3)
 
 # Create a test dataset by dropping the target column.
 test_dataset = valid_dataset.map_batches(
-    lambda df: df.drop("target", axis=1), batch_format="pandas"
+    lambda table: table.drop(["target"]), batch_format="pyarrow"
 )
 
 # Create a preprocessor to scale some columns
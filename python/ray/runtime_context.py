@@ -192,6 +192,22 @@ class RuntimeContext(object):
         worker.check_connected()
         return worker.core_worker.get_actor_handle(self.actor_id)
 
+    def get_assigned_resources(self):
+        """Get the resources assigned to the current task or actor.
+
+        Returns:
+            A dictionary mapping the name of a resource to the amount of it
+            assigned to the current worker.
+        """
+        if self.worker.mode != ray._private.worker.WORKER_MODE:
+            raise RuntimeError("This method is only available in a task or actor.")
+        self.worker.check_connected()
+        resource_id_map = self.worker.core_worker.resource_ids()
+        return {
+            resource: sum(amount for _, amount in resource_ids)
+            for resource, resource_ids in resource_id_map.items()
+        }
+
     @property
     def gcs_address(self):
         """Get the GCS address of the ray cluster.
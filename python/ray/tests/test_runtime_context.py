@@ -218,6 +218,25 @@ def test_no_auto_init(shutdown_only):
     assert not ray.is_initialized()
 
 
+def test_get_assigned_resources(shutdown_only):
+    ray.init(num_cpus=4)
+
+    @ray.remote(num_cpus=2)
+    def f():
+        return ray.get_runtime_context().get_assigned_resources()
+
+    @ray.remote(num_cpus=0.5)
+    def g():
+        return ray.get_runtime_context().get_assigned_resources()
+
+    assert ray.get(f.remote())["CPU"] == 2
+    assert ray.get(g.remote())["CPU"] == 0.5
+
+    # Only available inside tasks and actors.
+    with pytest.raises(RuntimeError):
+        ray.get_runtime_context().get_assigned_resources()
+
+
 if __name__ == "__main__":
     import pytest
 
@@ -113,17 +113,13 @@ def test_torch_prepare_dataloader(ray_start_4_cpus_2_gpus, dataset):
         # Case where the dataset returns a tuple or list from __getitem__.
         if isinstance(wrapped_data_loader.dataset[0], (tuple, list)):
             for batch in wrapped_data_loader:
-                x = batch[0]
-                y = batch[1]
-
                 # Make sure the data is on the correct device.
-                assert x.is_cuda and y.is_cuda
+                assert batch[0].is_cuda and batch[1].is_cuda
         # Case where the dataset returns a dict from __getitem__.
         elif isinstance(wrapped_data_loader.dataset[0], dict):
             for batch in wrapped_data_loader:
-                for x, y in zip(batch["x"], batch["y"]):
-                    # Make sure the data is on the correct device.
-                    assert x.is_cuda and y.is_cuda
+                # Make sure the data is on the correct device.
+                assert batch["x"].is_cuda and batch["y"].is_cuda
 
     trainer = Trainer("torch", num_workers=2, use_gpu=True)
     trainer.start()
@@ -146,6 +142,8 @@ def test_enable_reproducibility(ray_start_4_cpus_2_gpus, use_gpu):
         model = torchvision.models.resnet18()
         model = train.torch.prepare_model(model)
 
+        # The dataset is regenerated on every run on purpose: identical
+        # random data across runs is part of what is being tested.
         dataset_length = 128
         dataset = torch.utils.data.TensorDataset(
             torch.randn(dataset_length, 3, 32, 32),
@@ -169,6 +167,7 @@ def test_enable_reproducibility(ray_start_4_cpus_2_gpus, use_gpu):
 
         return loss.item()
 
+    # Reuse the same workers for both runs to avoid paying the startup cost twice.
     trainer = Trainer("torch", num_workers=2, use_gpu=use_gpu)
     trainer.start()
     result1 = trainer.run(train_func)
@@ -406,13 +405,24 @@ def test_auto_transfer_data_from_host_to_device(
             func(device)
             end.record()
             torch.cuda.synchronize()
-        runtime.append(start.elapsed_time(end))
+            runtime.append(start.elapsed_time(end))
         return np.mean(runtime)
 
+    # Pin the host memory on CUDA so that only the pipelining differs between
+    # the two configurations.
     small_dataloader = [
-        (torch.randn((1024 * 4, 1024 * 4), device="cpu"),) for _ in range(10)
+        (
+            torch.randn(
+                (1024 * 4, 1024 * 4),
+                device="cpu",
+                pin_memory=device_choice == "cuda",
+            ),
+        )
+        for _ in range(10)
     ]
 
+    # The baseline copies synchronously, so copies never overlap with the
+    # computation.
     def host_to_device(device):
         for (x,) in small_dataloader:
             x = x.to(device)
@@ -8,6 +8,7 @@ import pyarrow as pa
 import pytest
 import xgboost as xgb
 
+import ray
 from ray.air._internal.checkpointing import save_preprocessor_to_dir
 from ray.air.checkpoint import Checkpoint
 from ray.air.constants import MODEL_KEY
@@ -17,6 +18,14 @@ from ray.train.predictor import TYPE_TO_ENUM
 from ray.train.xgboost import XGBoostPredictor, to_air_checkpoint
 
 
+@pytest.fixture
+def ray_start_4_cpus():
+    address_info = ray.init(num_cpus=4)
+    yield address_info
+    # The code after the yield will run as teardown code.
+    ray.shutdown()
+
+
 class DummyPreprocessor(Preprocessor):
     def transform_batch(self, df):
         self._batch_transformed = True
@@ -67,6 +76,24 @@ def test_predict(batch_type):
     assert hasattr(predictor.preprocessor, "_batch_transformed")
 
 
+@pytest.mark.parametrize("batch_type", [pd.DataFrame, pa.Table, dict])
+def test_predict_string_columns(batch_type):
+    pandas_data = pd.DataFrame(dummy_data, columns=["A", "B"])
+    pandas_model = (
+        xgb.XGBClassifier(n_estimators=10).fit(pandas_data, dummy_target).get_booster()
+    )
+    predictor = XGBoostPredictor(model=pandas_model)
+
+    # Dict batches are converted to tensor extension columns, which must not
+    # be passed to ``xgboost.DMatrix`` as a DataFrame.
+    data_batch = convert_pandas_to_batch_type(
+        pandas_data, type=TYPE_TO_ENUM[batch_type]
+    )
+    predictions = predictor.predict(data_batch)
+
+    assert len(predictions) == 3
+
+
 def test_predict_feature_columns():
     preprocessor = DummyPreprocessor()
     predictor = XGBoostPredictor(model=model, preprocessor=preprocessor)
@@ -95,6 +122,124 @@ def test_predict_feature_columns_pandas():
     assert hasattr(predictor.preprocessor, "_batch_transformed")
 
 
+@pytest.mark.parametrize(
+    "dmatrix_kwargs",
+    [
+        # Handled by ``inplace_predict``.
+        {"missing": np.nan, "nthread": 1},
+        # Not supported by ``inplace_predict``, so a DMatrix is constructed.
+        {"feature_names": None},
+    ],
+)
+def test_predict_dmatrix_kwargs(dmatrix_kwargs):
+    predictor = XGBoostPredictor(model=model)
+
+    data_batch = pd.DataFrame(dummy_data)
+    predictions = predictor.predict(data_batch)
+    dmatrix_predictions = predictor.predict(data_batch, dmatrix_kwargs=dmatrix_kwargs)
+
+    pd.testing.assert_frame_equal(predictions, dmatrix_predictions)
+
+
+def test_predict_float_pandas():
+    pandas_data = pd.DataFrame(dummy_data.astype(np.float64), columns=["A", "B"])
+    pandas_model = (
+        xgb.XGBClassifier(n_estimators=10).fit(pandas_data, dummy_target).get_booster()
+    )
+    predictor = XGBoostPredictor(model=pandas_model)
+
+    predictions = predictor.predict(pandas_data)
+    assert len(predictions) == 3
+
+    data_batch = pandas_data.assign(C=[7.0, 8.0, 9.0])
+    predictions = predictor.predict(data_batch, feature_columns=["A", "B"])
+    assert len(predictions) == 3
+
+    # Feature names are validated against the model.
+    with pytest.raises(ValueError):
+        predictor.predict(pandas_data[["B", "A"]])
+
+
+def test_predict_gblinear():
+    gblinear_model = (
+        xgb.XGBClassifier(n_estimators=10, booster="gblinear")
+        .fit(dummy_data, dummy_target)
+        .get_booster()
+    )
+    predictor = XGBoostPredictor(model=gblinear_model)
+
+    predictions = predictor.predict(dummy_data)
+
+    assert len(predictions) == 3
+
+
+@pytest.mark.parametrize("downcast_fp32", [False, True])
+def test_predict_downcast_fp32(monkeypatch, downcast_fp32):
+    input_dtypes = []
+
+    dmatrix_cls = xgb.DMatrix
+
+    def record_dmatrix(data, *args, **kwargs):
+        if isinstance(data, np.ndarray):
+            input_dtypes.append(data.dtype)
+        else:
+            input_dtypes.append(tuple(data.dtypes))
+        return dmatrix_cls(data, *args, **kwargs)
+
+    monkeypatch.setattr(xgb, "DMatrix", record_dmatrix)
+    # ``feature_names`` forces the DMatrix path.
+    dmatrix_kwargs = {"feature_names": None}
+
+    # Float64 arrays are only converted if ``downcast_fp32`` is set.
+    predictor = XGBoostPredictor(model=model, downcast_fp32=downcast_fp32)
+    predictions = predictor.predict(
+        dummy_data.astype(np.float64), dmatrix_kwargs=dmatrix_kwargs
+    )
+    fp64_predictions = XGBoostPredictor(model=model).predict(
+        dummy_data.astype(np.float64), dmatrix_kwargs=dmatrix_kwargs
+    )
+    np.testing.assert_array_equal(predictions, fp64_predictions)
+    assert input_dtypes[0] == (np.float32 if downcast_fp32 else np.float64)
+
+    # DataFrames are passed to XGBoost unchanged.
+    pandas_data = pd.DataFrame(dummy_data.astype(np.float64), columns=["A", "B"])
+    pandas_model = (
+        xgb.XGBClassifier(n_estimators=10).fit(pandas_data, dummy_target).get_booster()
+    )
+    predictor = XGBoostPredictor(model=pandas_model, downcast_fp32=downcast_fp32)
+    predictor.predict(pandas_data, dmatrix_kwargs=dmatrix_kwargs)
+    assert input_dtypes[-1] == (np.float64, np.float64)
+
+
+def test_predict_feature_plan_cache():
+    predictor = XGBoostPredictor(model=model)
+    wide_data = np.array([[1, 2, 7], [3, 4, 8], [5, 6, 9]])
+
+    # The cached feature plan must be rebuilt whenever the batch changes.
+    batches = [
+        (wide_data, {"feature_columns": [0, 1]}),
+        (pd.DataFrame(wide_data), {"feature_columns": [0, 1]}),
+        (pd.DataFrame(dummy_data), {}),
+        (pd.DataFrame(dummy_data, columns=[5, 6]), {}),
+        (dummy_data, {}),
+    ]
+    for data_batch, kwargs in batches:
+        predictions = predictor.predict(data_batch, **kwargs)
+        expected = XGBoostPredictor(model=model).predict(data_batch, **kwargs)
+        np.testing.assert_array_equal(np.asarray(predictions), np.asarray(expected))
+
+
+@pytest.mark.parametrize("num_cpus,num_threads", [(2, 2), (0.5, 1), (0, 1)])
+def test_num_threads(ray_start_4_cpus, num_cpus, num_threads):
+    @ray.remote(num_cpus=num_cpus)
+    def get_num_threads():
+        return XGBoostPredictor(model=model)._num_threads
+
+    assert ray.get(get_num_threads.remote()) == num_threads
+    # Outside of tasks and actors, all CPUs of the node are used.
+    assert XGBoostPredictor(model=model)._num_threads == os.cpu_count()
+
+
 def test_predict_no_preprocessor_no_training():
     with tempfile.TemporaryDirectory() as tmpdir:
         checkpoint = to_air_checkpoint(tmpdir, booster=model)
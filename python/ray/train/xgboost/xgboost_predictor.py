@@ -1,8 +1,14 @@
+import inspect
+import json
+import os
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 import xgboost
 
+import ray
 from ray.air.checkpoint import Checkpoint
 from ray.air.constants import TENSOR_COLUMN_NAME
 from ray.train.predictor import Predictor
@@ -11,6 +17,66 @@ from ray.train.xgboost.utils import load_checkpoint
 if TYPE_CHECKING:
     from ray.data.preprocessor import Preprocessor
 
+_INPLACE_PREDICT_PARAMS = frozenset(
+    inspect.signature(xgboost.Booster.inplace_predict).parameters
+)
+# Keyword arguments of ``xgboost.Booster.predict`` that are also accepted by
+# ``xgboost.Booster.inplace_predict`` in the installed xgboost version.
+_INPLACE_PREDICT_KWARGS = _INPLACE_PREDICT_PARAMS.intersection(
+    inspect.signature(xgboost.Booster.predict).parameters
+) - {"self", "data"}
+# Keyword arguments of ``xgboost.DMatrix`` that can be handled without
+# constructing a DMatrix. ``nthread`` only affects DMatrix construction, so it
+# is dropped, and ``missing`` is forwarded to ``inplace_predict``.
+_INPLACE_DMATRIX_KWARGS = frozenset(["nthread"]) | (
+    _INPLACE_PREDICT_PARAMS & {"missing"}
+)
+
+
+def _get_num_threads() -> int:
+    """Return the number of threads XGBoost should use for prediction.
+
+    Inside a Ray task or actor this is the number of CPUs assigned to it, and
+    at least one. Otherwise, the CPU count of the node is used.
+    """
+    if ray.is_initialized() and not ray.util.client.ray.is_connected():
+        try:
+            resources = ray.get_runtime_context().get_assigned_resources()
+        except RuntimeError:
+            # Called from the driver or in local mode.
+            pass
+        else:
+            return max(1, int(resources.get("CPU", 0)))
+    return os.cpu_count() or 1
+
+
+def _is_tree_booster(booster: xgboost.Booster) -> bool:
+    """Whether ``booster`` uses ``gbtree``, the only booster type supported by
+    ``xgboost.Booster.inplace_predict``."""
+    config = json.loads(booster.save_config())
+    return config["learner"]["gradient_booster"]["name"] == "gbtree"
+
+
+@dataclass
+class _FeaturePlan:
+    """Describes how the model input is extracted from a data batch.
+
+    Args:
+        mode: "tensor" to read the tensor column, "cols" to select
+            ``columns`` from the batch or "all" to use every column.
+        columns: The ``feature_columns`` the plan was built for, if any.
+        feature_names: The feature names seen by XGBoost, if any.
+        use_dataframe: Whether the features are passed to XGBoost as a
+            DataFrame. If False, they are converted to a NumPy array.
+        data_dtypes: The column dtypes of the batch the plan was built for.
+    """
+
+    mode: str
+    columns: Optional[Union[List[str], List[int]]]
+    feature_names: Optional[List[str]]
+    use_dataframe: bool
+    data_dtypes: pd.Series
+
 
 class XGBoostPredictor(Predictor):
     """A predictor for XGBoost models.
@@ -19,28 +85,96 @@ class XGBoostPredictor(Predictor):
         model: The XGBoost booster to use for predictions.
         preprocessor: A preprocessor used to transform data batches prior
             to prediction.
+        downcast_fp32: Whether to convert float64 feature arrays to float32
+            before they are passed to XGBoost. XGBoost predicts on float32
+            values, so the predictions are unchanged. DataFrames are never
+            converted, since XGBoost already casts them in a single pass.
     """
 
     def __init__(
-        self, model: xgboost.Booster, preprocessor: Optional["Preprocessor"] = None
+        self,
+        model: xgboost.Booster,
+        preprocessor: Optional["Preprocessor"] = None,
+        downcast_fp32: bool = False,
     ):
         self.model = model
         self.preprocessor = preprocessor
+        self.downcast_fp32 = downcast_fp32
+        self._feature_plan = None
+        self._num_threads = _get_num_threads()
+        self._is_tree_booster = _is_tree_booster(model)
 
     @classmethod
-    def from_checkpoint(cls, checkpoint: Checkpoint) -> "XGBoostPredictor":
+    def from_checkpoint(
+        cls, checkpoint: Checkpoint, downcast_fp32: bool = False
+    ) -> "XGBoostPredictor":
         """Instantiate the predictor from a Checkpoint.
 
         The checkpoint is expected to be a result of ``XGBoostTrainer``.
+        The loaded booster is configured to predict with as many threads as
+        CPUs assigned to the current Ray task or actor.
 
         Args:
             checkpoint: The checkpoint to load the model and
                 preprocessor from. It is expected to be from the result of a
                 ``XGBoostTrainer`` run.
+            downcast_fp32: Whether to convert float64 feature arrays to
+                float32 before they are passed to XGBoost.
 
         """
         bst, preprocessor = load_checkpoint(checkpoint)
-        return XGBoostPredictor(model=bst, preprocessor=preprocessor)
+        predictor = XGBoostPredictor(
+            model=bst, preprocessor=preprocessor, downcast_fp32=downcast_fp32
+        )
+        bst.set_param({"nthread": predictor._num_threads})
+        return predictor
+
+    def _get_feature_plan(
+        self,
+        data: "pd.DataFrame",
+        feature_columns: Optional[Union[List[str], List[int]]],
+    ) -> _FeaturePlan:
+        """Return the feature plan for ``data``, reusing the cached one if the
+        batch has the same columns and dtypes as the previous one."""
+        plan = self._feature_plan
+        data_dtypes = data.dtypes
+        if (
+            plan is not None
+            and plan.columns == (feature_columns or None)
+            and plan.data_dtypes.equals(data_dtypes)
+        ):
+            return plan
+
+        if TENSOR_COLUMN_NAME in data:
+            mode = "tensor"
+            feature_names = None
+            use_dataframe = False
+        else:
+            mode = "cols" if feature_columns else "all"
+            columns = feature_columns if feature_columns else data.columns
+            # Only set the feature names if they are strings.
+            if all(isinstance(fc, str) for fc in columns):
+                feature_names = list(columns)
+            else:
+                feature_names = None
+            # DMatrix reads DataFrames natively and takes the feature names
+            # from the columns, so avoid an extra NumPy copy. This only works
+            # for plain NumPy numeric and bool dtypes; tensor extension,
+            # object and nullable columns are converted to NumPy instead.
+            feature_dtypes = data_dtypes[columns] if feature_columns else data_dtypes
+            use_dataframe = feature_names is not None and all(
+                isinstance(dtype, np.dtype) and dtype.kind in "biuf"
+                for dtype in feature_dtypes
+            )
+
+        self._feature_plan = _FeaturePlan(
+            mode=mode,
+            columns=list(feature_columns) if feature_columns else None,
+            feature_names=feature_names,
+            use_dataframe=use_dataframe,
+            data_dtypes=data_dtypes,
+        )
+        return self._feature_plan
 
     def _predict_pandas(
         self,
@@ -51,8 +185,11 @@ class XGBoostPredictor(Predictor):
     ) -> "pd.DataFrame":
         """Run inference on data batch.
 
-        The data is converted into an XGBoost DMatrix before being inputted to
-        the model.
+        If the features are a NumPy array, the model is a tree booster without
+        feature names, and all ``dmatrix_kwargs`` and ``predict_kwargs`` are
+        supported by ``xgboost.Booster.inplace_predict``, the data is passed to
+        the model directly. Otherwise, the data is converted into an XGBoost
+        DMatrix before being inputted to the model.
 
         Args:
             data: A batch of input data.
@@ -60,6 +197,8 @@ class XGBoostPredictor(Predictor):
                 data to use as features to predict on. If None, then use
                 all columns in ``data``.
             dmatrix_kwargs: Dict of keyword arguments passed to ``xgboost.DMatrix``.
+                ``nthread`` defaults to the number of CPUs assigned to the
+                current Ray task or actor.
             **predict_kwargs: Keyword arguments passed to ``xgboost.Booster.predict``.
 
         Examples:
@@ -108,35 +247,63 @@ class XGBoostPredictor(Predictor):
             Prediction result.
 
         """
-        dmatrix_kwargs = dmatrix_kwargs or {}
-
-        feature_names = None
-        if TENSOR_COLUMN_NAME in data:
+        plan = self._get_feature_plan(data, feature_columns)
+        if plan.mode == "tensor":
             data = data[TENSOR_COLUMN_NAME].to_numpy()
-            if feature_columns:
-                # In this case feature_columns is a list of integers
-                data = data[:, feature_columns]
-        elif feature_columns:
-            # feature_columns is a list of integers or strings
-            data = data[feature_columns].to_numpy()
-            # Only set the feature names if they are strings
-            if all(isinstance(fc, str) for fc in feature_columns):
-                feature_names = feature_columns
+            if data.dtype == object:
+                # Stack object arrays of ndarrays into a single buffer.
+                data = np.stack(data, axis=0)
+            if plan.columns:
+                # In this case the columns are a list of integers. Advanced
+                # indexing returns a contiguous copy.
+                data = data[:, plan.columns]
         else:
-            feature_columns = data.columns.tolist()
-            data = data.to_numpy()
-
-            if all(isinstance(fc, str) for fc in feature_columns):
-                feature_names = feature_columns
+            if plan.mode == "cols":
+                data = data[plan.columns]
+            if not plan.use_dataframe:
+                data = data.to_numpy()
+                if plan.feature_names:
+                    dmatrix_kwargs = {
+                        "feature_names": plan.feature_names,
+                        **(dmatrix_kwargs or {}),
+                    }
+
+        if (
+            self.downcast_fp32
+            and isinstance(data, np.ndarray)
+            and data.dtype == np.float64
+        ):
+            # Cast after selecting the feature columns, so that dropped
+            # columns are not converted.
+            data = np.ascontiguousarray(data, dtype=np.float32)
 
-        if feature_names:
-            dmatrix_kwargs["feature_names"] = feature_names
-
-        matrix = xgboost.DMatrix(data, **dmatrix_kwargs)
-        df = pd.DataFrame(self.model.predict(matrix, **predict_kwargs))
-        df.columns = (
-            ["predictions"]
-            if len(df.columns) == 1
-            else [f"predictions_{i}" for i in range(len(df.columns))]
+        dmatrix_kwargs = dmatrix_kwargs or {}
+        if (
+            self._is_tree_booster
+            # ``inplace_predict`` doesn't validate feature names for arrays.
+            and self.model.feature_names is None
+            and isinstance(data, np.ndarray)
+            and data.dtype.kind in "biuf"
+            and dmatrix_kwargs.keys() <= _INPLACE_DMATRIX_KWARGS
+            and predict_kwargs.keys() <= _INPLACE_PREDICT_KWARGS
+        ):
+            # Skip the per-batch DMatrix construction. Older xgboost versions
+            # require C-contiguous arrays here.
+            data = np.ascontiguousarray(data)
+            if "missing" in dmatrix_kwargs:
+                predict_kwargs["missing"] = dmatrix_kwargs["missing"]
+            predictions = self.model.inplace_predict(data, **predict_kwargs)
+        else:
+            dmatrix_kwargs = {"nthread": self._num_threads, **dmatrix_kwargs}
+            matrix = xgboost.DMatrix(data, **dmatrix_kwargs)
+            predictions = self.model.predict(matrix, **predict_kwargs)
+
+        df = pd.DataFrame(
+            predictions,
+            columns=(
+                ["predictions"]
+                if predictions.ndim == 1 or predictions.shape[1] == 1
+                else [f"predictions_{i}" for i in range(predictions.shape[1])]
+            ),
         )
         return df